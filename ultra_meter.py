@@ -1,21 +1,33 @@
 # ultra_meter.py
-import os, sys, json, time, winreg
+import os, sys, json, time, winreg, ctypes, threading
+from ctypes import wintypes
 from dataclasses import dataclass
 from typing import Optional, Tuple
 
-import psutil
-
-from PyQt6.QtCore import Qt, QTimer, QPoint
-from PyQt6.QtGui import QFont, QKeySequence, QShortcut, QIcon, QPixmap, QAction
-from PyQt6.QtWidgets import QApplication, QWidget, QLabel, QHBoxLayout, QSystemTrayIcon, QMenu
+from PyQt6.QtCore import Qt, QTimer, QPoint, QRect, QEvent, QObject, QThread, pyqtSignal, pyqtSlot
+from PyQt6.QtGui import (QFont, QFontMetrics, QKeySequence, QShortcut, QIcon, QPixmap, QAction,
+                         QPainter, QColor)
+from PyQt6.QtWidgets import QApplication, QWidget, QSystemTrayIcon, QMenu, QToolTip
 
 import win32gui
-import win32con
 
 APP_NAME = "UltraMeter"
 REFRESH_MS = 1000   # set 500 for ~0.5s updates
 MARGIN_PX = 2
+TRAY_SETTLE_MS = 500      # let Explorer finish moving the taskbar before re-docking
+TRAY_CHECK_MS = 60_000    # fallback re-dock poll, only used if the tray WinEvent hook fails
+SAVE_DELAY_MS = 500       # coalesce bursts of settings changes into one write
 W, H = 230, 26
+PAD_X, PAD_Y = 10, 2      # strip content margins
+GAP = 6                   # spacing between painted items
+
+# The handful of win32con values used below; importing win32con itself
+# executes thousands of assignments at startup.
+GWL_EXSTYLE = -20
+WS_EX_TRANSPARENT = 0x00000020
+WS_EX_LAYERED = 0x00080000
+WM_SETTINGCHANGE = 0x001A
+WM_DISPLAYCHANGE = 0x007E
 
 # ====== persistence ======
 def appdata_dir() -> str:
@@ -35,7 +47,7 @@ def load_settings() -> dict:
 def save_settings(d: dict) -> None:
     try:
         with open(SETTINGS_PATH, "w", encoding="utf-8") as f:
-            json.dump(d, f, indent=2)
+            json.dump(d, f, separators=(",", ":"))
     except Exception:
         pass
 
@@ -43,6 +55,11 @@ def asset_path(name: str) -> str:
     base = getattr(sys, "_MEIPASS", os.path.dirname(os.path.abspath(__file__)))
     return os.path.join(base, "assets", name)
 
+def load_asset(cls, name: str, default=None):
+    """`cls(path)` for a bundled asset, or `default` when the file is missing."""
+    p = asset_path(name)
+    return cls(p) if os.path.exists(p) else default
+
 def exe_path() -> str:
     if getattr(sys, "frozen", False):
         return sys.executable
@@ -76,50 +93,341 @@ def set_autostart(enable: bool) -> None:
         pass
 
 # ====== taskbar tray geometry ======
-def get_tray_rect() -> Optional[Tuple[int, int, int, int]]:
+# Shell_TrayWnd / TrayNotifyWnd, found once and reused until Explorer recreates them
+_tray_hwnd = 0
+_trayn_hwnd = 0
+
+def find_tray_windows() -> Tuple[int, int]:
+    global _tray_hwnd, _trayn_hwnd
     tray = win32gui.FindWindow("Shell_TrayWnd", None)
-    if not tray: return None
-    child = None
+    child = 0
     def enum_child(h, _):
         nonlocal child
         if win32gui.GetClassName(h) == "TrayNotifyWnd":
             child = h
             return False
         return True
-    try:
-        win32gui.EnumChildWindows(tray, enum_child, None)
-    except win32gui.error:
-        pass
-    target = child if child else tray
+    if tray:
+        try:
+            win32gui.EnumChildWindows(tray, enum_child, None)
+        except win32gui.error:
+            pass
+    _tray_hwnd, _trayn_hwnd = tray, child
+    return tray, child
+
+def get_tray_rect() -> Optional[Tuple[int, int, int, int]]:
+    target = _trayn_hwnd or _tray_hwnd
+    if target:
+        try:
+            return win32gui.GetWindowRect(target)
+        except win32gui.error:
+            pass   # stale handle (Explorer restarted): look the windows up again
+    tray, child = find_tray_windows()
+    target = child or tray
+    if not target: return None
     try:
         return win32gui.GetWindowRect(target)
     except win32gui.error:
         return None
 
+# Taskbar moves are observed with an out-of-context WinEvent hook on Explorer's
+# tray thread rather than by polling get_tray_rect().
+EVENT_OBJECT_LOCATIONCHANGE = 0x800B
+WINEVENT_OUTOFCONTEXT = 0x0000
+OBJID_WINDOW = 0
+
+_WINEVENTPROC = ctypes.WINFUNCTYPE(None, wintypes.HANDLE, wintypes.DWORD, wintypes.HWND,
+                                   wintypes.LONG, wintypes.LONG, wintypes.DWORD, wintypes.DWORD)
+_user32 = ctypes.WinDLL("user32")
+_SetWinEventHook = _user32.SetWinEventHook
+_SetWinEventHook.argtypes = [wintypes.DWORD, wintypes.DWORD, wintypes.HMODULE, _WINEVENTPROC,
+                             wintypes.DWORD, wintypes.DWORD, wintypes.DWORD]
+_SetWinEventHook.restype = wintypes.HANDLE
+_UnhookWinEvent = _user32.UnhookWinEvent
+_UnhookWinEvent.argtypes = [wintypes.HANDLE]
+_UnhookWinEvent.restype = wintypes.BOOL
+_GetWindowThreadProcessId = _user32.GetWindowThreadProcessId
+_GetWindowThreadProcessId.argtypes = [wintypes.HWND, ctypes.POINTER(wintypes.DWORD)]
+_GetWindowThreadProcessId.restype = wintypes.DWORD
+WM_TASKBARCREATED = _user32.RegisterWindowMessageW("TaskbarCreated")   # Explorer (re)started
+
+# Whether to re-dock is decided on the taskbar's placement (edge, size, work area),
+# not on the live TrayNotifyWnd rect, which moves every time an auto-hide bar slides.
+ABM_GETSTATE = 0x04
+ABM_GETTASKBARPOS = 0x05
+ABS_AUTOHIDE = 0x01
+MONITOR_DEFAULTTONEAREST = 2
+
+class APPBARDATA(ctypes.Structure):
+    _fields_ = [("cbSize", wintypes.DWORD), ("hWnd", wintypes.HWND),
+                ("uCallbackMessage", wintypes.UINT), ("uEdge", wintypes.UINT),
+                ("rc", wintypes.RECT), ("lParam", wintypes.LPARAM)]
+
+class MONITORINFO(ctypes.Structure):
+    _fields_ = [("cbSize", wintypes.DWORD), ("rcMonitor", wintypes.RECT),
+                ("rcWork", wintypes.RECT), ("dwFlags", wintypes.DWORD)]
+
+_SHAppBarMessage = ctypes.WinDLL("shell32").SHAppBarMessage
+_SHAppBarMessage.argtypes = [wintypes.DWORD, ctypes.POINTER(APPBARDATA)]
+_SHAppBarMessage.restype = ctypes.c_size_t
+_MonitorFromRect = _user32.MonitorFromRect
+_MonitorFromRect.argtypes = [ctypes.POINTER(wintypes.RECT), wintypes.DWORD]
+_MonitorFromRect.restype = wintypes.HMONITOR
+_GetMonitorInfoW = _user32.GetMonitorInfoW
+_GetMonitorInfoW.argtypes = [wintypes.HMONITOR, ctypes.POINTER(MONITORINFO)]
+_GetMonitorInfoW.restype = wintypes.BOOL
+
+def get_taskbar_placement() -> Optional[tuple]:
+    """(edge, width, height, work area) of the taskbar; unchanged while an auto-hide bar slides."""
+    abd = APPBARDATA(cbSize=ctypes.sizeof(APPBARDATA))
+    if not _SHAppBarMessage(ABM_GETTASKBARPOS, ctypes.byref(abd)):
+        return None
+    rc = abd.rc
+    mi = MONITORINFO(cbSize=ctypes.sizeof(MONITORINFO))
+    if not _GetMonitorInfoW(_MonitorFromRect(ctypes.byref(rc), MONITOR_DEFAULTTONEAREST), ctypes.byref(mi)):
+        return None
+    w = mi.rcWork
+    return abd.uEdge, rc.right - rc.left, rc.bottom - rc.top, (w.left, w.top, w.right, w.bottom)
+
+def taskbar_autohide() -> bool:
+    abd = APPBARDATA(cbSize=ctypes.sizeof(APPBARDATA))
+    return bool(_SHAppBarMessage(ABM_GETSTATE, ctypes.byref(abd)) & ABS_AUTOHIDE)
+
+# ====== session lock notifications ======
+WM_WTSSESSION_CHANGE = 0x02B1
+WTS_SESSION_LOCK = 0x7
+WTS_SESSION_UNLOCK = 0x8
+NOTIFY_FOR_THIS_SESSION = 0
+
+_wtsapi32 = ctypes.WinDLL("wtsapi32")
+_WTSRegisterSessionNotification = _wtsapi32.WTSRegisterSessionNotification
+_WTSRegisterSessionNotification.argtypes = [wintypes.HWND, wintypes.DWORD]
+_WTSRegisterSessionNotification.restype = wintypes.BOOL
+_WTSUnRegisterSessionNotification = _wtsapi32.WTSUnRegisterSessionNotification
+_WTSUnRegisterSessionNotification.argtypes = [wintypes.HWND]
+_WTSUnRegisterSessionNotification.restype = wintypes.BOOL
+
+# ====== network counters (iphlpapi) ======
+# Query iphlpapi directly instead of going through psutil, whose Windows
+# backend calls GetAdaptersAddresses (incl. DNS info) twice on every tick.
+IF_MAX_STRING_SIZE = 256
+IF_MAX_PHYS_ADDRESS_LENGTH = 32
+IF_TYPE_SOFTWARE_LOOPBACK = 24
+IF_OPER_STATUS_UP = 1
+
+class GUID(ctypes.Structure):
+    _fields_ = [("Data1", wintypes.DWORD), ("Data2", wintypes.WORD),
+                ("Data3", wintypes.WORD), ("Data4", ctypes.c_ubyte * 8)]
+
+class MIB_IF_ROW2(ctypes.Structure):
+    _fields_ = [
+        ("InterfaceLuid", ctypes.c_uint64),
+        ("InterfaceIndex", wintypes.ULONG),
+        ("InterfaceGuid", GUID),
+        ("Alias", wintypes.WCHAR * (IF_MAX_STRING_SIZE + 1)),
+        ("Description", wintypes.WCHAR * (IF_MAX_STRING_SIZE + 1)),
+        ("PhysicalAddressLength", wintypes.ULONG),
+        ("PhysicalAddress", ctypes.c_ubyte * IF_MAX_PHYS_ADDRESS_LENGTH),
+        ("PermanentPhysicalAddress", ctypes.c_ubyte * IF_MAX_PHYS_ADDRESS_LENGTH),
+        ("Mtu", wintypes.ULONG),
+        ("Type", wintypes.ULONG),
+        ("TunnelType", ctypes.c_int),
+        ("MediaType", ctypes.c_int),
+        ("PhysicalMediumType", ctypes.c_int),
+        ("AccessType", ctypes.c_int),
+        ("DirectionType", ctypes.c_int),
+        ("InterfaceAndOperStatusFlags", ctypes.c_ubyte),
+        ("OperStatus", ctypes.c_int),
+        ("AdminStatus", ctypes.c_int),
+        ("MediaConnectState", ctypes.c_int),
+        ("NetworkGuid", GUID),
+        ("ConnectionType", ctypes.c_int),
+        ("TransmitLinkSpeed", ctypes.c_uint64),
+        ("ReceiveLinkSpeed", ctypes.c_uint64),
+        ("InOctets", ctypes.c_uint64),
+        ("InUcastPkts", ctypes.c_uint64),
+        ("InNUcastPkts", ctypes.c_uint64),
+        ("InDiscards", ctypes.c_uint64),
+        ("InErrors", ctypes.c_uint64),
+        ("InUnknownProtos", ctypes.c_uint64),
+        ("InUcastOctets", ctypes.c_uint64),
+        ("InMulticastOctets", ctypes.c_uint64),
+        ("InBroadcastOctets", ctypes.c_uint64),
+        ("OutOctets", ctypes.c_uint64),
+        ("OutUcastPkts", ctypes.c_uint64),
+        ("OutNUcastPkts", ctypes.c_uint64),
+        ("OutDiscards", ctypes.c_uint64),
+        ("OutErrors", ctypes.c_uint64),
+        ("OutUcastOctets", ctypes.c_uint64),
+        ("OutMulticastOctets", ctypes.c_uint64),
+        ("OutBroadcastOctets", ctypes.c_uint64),
+        ("OutQLen", ctypes.c_uint64),
+    ]
+
+# Leading fields of IP_ADAPTER_ADDRESSES_LH, up to Luid. Only ever read through
+# pointers into the buffer GetAdaptersAddresses fills, never allocated directly.
+class IP_ADAPTER_ADDRESSES(ctypes.Structure):
+    pass
+
+IP_ADAPTER_ADDRESSES._fields_ = [
+    ("Length", wintypes.ULONG),
+    ("IfIndex", wintypes.DWORD),
+    ("Next", ctypes.POINTER(IP_ADAPTER_ADDRESSES)),
+    ("AdapterName", ctypes.c_char_p),
+    ("FirstUnicastAddress", ctypes.c_void_p),
+    ("FirstAnycastAddress", ctypes.c_void_p),
+    ("FirstMulticastAddress", ctypes.c_void_p),
+    ("FirstDnsServerAddress", ctypes.c_void_p),
+    ("DnsSuffix", ctypes.c_wchar_p),
+    ("Description", ctypes.c_wchar_p),
+    ("FriendlyName", ctypes.c_wchar_p),
+    ("PhysicalAddress", ctypes.c_ubyte * 8),
+    ("PhysicalAddressLength", wintypes.ULONG),
+    ("Flags", wintypes.ULONG),
+    ("Mtu", wintypes.ULONG),
+    ("IfType", wintypes.ULONG),
+    ("OperStatus", ctypes.c_int),
+    ("Ipv6IfIndex", wintypes.DWORD),
+    ("ZoneIndices", wintypes.ULONG * 16),
+    ("FirstPrefix", ctypes.c_void_p),
+    ("TransmitLinkSpeed", ctypes.c_uint64),
+    ("ReceiveLinkSpeed", ctypes.c_uint64),
+    ("FirstWinsServerAddress", ctypes.c_void_p),
+    ("FirstGatewayAddress", ctypes.c_void_p),
+    ("Ipv4Metric", wintypes.ULONG),
+    ("Ipv6Metric", wintypes.ULONG),
+    ("Luid", ctypes.c_uint64),
+]
+
+AF_UNSPEC = 0
+GAA_FLAG_SKIP_UNICAST = 0x0001
+GAA_FLAG_SKIP_ANYCAST = 0x0002
+GAA_FLAG_SKIP_MULTICAST = 0x0004
+GAA_FLAG_SKIP_DNS_SERVER = 0x0008
+GAA_FLAG_SKIP_FRIENDLY_NAME = 0x0020
+GAA_FLAG_SKIP_DNS_INFO = 0x0800
+GAA_FLAGS = (GAA_FLAG_SKIP_UNICAST | GAA_FLAG_SKIP_ANYCAST | GAA_FLAG_SKIP_MULTICAST |
+             GAA_FLAG_SKIP_DNS_SERVER | GAA_FLAG_SKIP_FRIENDLY_NAME | GAA_FLAG_SKIP_DNS_INFO)
+ERROR_BUFFER_OVERFLOW = 111
+RESCAN_S = 30.0   # adapter list re-read interval, only if change notifications are unavailable
+
+_iphlpapi = ctypes.WinDLL("iphlpapi")
+_GetAdaptersAddresses = _iphlpapi.GetAdaptersAddresses
+_GetAdaptersAddresses.argtypes = [wintypes.ULONG, wintypes.ULONG, ctypes.c_void_p,
+                                  ctypes.c_void_p, ctypes.POINTER(wintypes.ULONG)]
+_GetAdaptersAddresses.restype = wintypes.ULONG
+_GetIfEntry2 = _iphlpapi.GetIfEntry2
+_GetIfEntry2.argtypes = [ctypes.POINTER(MIB_IF_ROW2)]
+_GetIfEntry2.restype = wintypes.DWORD
+_IP_INTERFACE_CHANGE_CB = ctypes.WINFUNCTYPE(None, ctypes.c_void_p, ctypes.c_void_p, ctypes.c_int)
+_NotifyIpInterfaceChange = _iphlpapi.NotifyIpInterfaceChange
+_NotifyIpInterfaceChange.argtypes = [wintypes.USHORT, _IP_INTERFACE_CHANGE_CB, ctypes.c_void_p,
+                                     wintypes.BOOLEAN, ctypes.POINTER(wintypes.HANDLE)]
+_NotifyIpInterfaceChange.restype = wintypes.DWORD
+_CancelMibChangeNotify2 = _iphlpapi.CancelMibChangeNotify2
+_CancelMibChangeNotify2.argtypes = [wintypes.HANDLE]
+_CancelMibChangeNotify2.restype = wintypes.DWORD
+
+@dataclass
+class Snapshot:
+    sent: int
+    recv: int
+    ts: int   # time.monotonic_ns()
+
+class NetCounterSource:
+    """Sums byte counters over a cached list of up, non-loopback adapters.
+
+    The adapter list comes from one GetAdaptersAddresses call (with all the
+    address/DNS collection skipped) and is only re-read when Windows reports
+    an interface change; each tick then costs one GetIfEntry2 per adapter.
+    """
+    def __init__(self):
+        self.luids: list[int] = []
+        self.last_refresh = 0.0
+        self.rescanned = False   # True when the last read() isn't comparable to the one before
+        self._buf_size = 16 * 1024
+        self._row = MIB_IF_ROW2()
+
+        # set from an iphlpapi worker thread, consumed by the next read()
+        self.changed = threading.Event()
+        self._notify_cb = _IP_INTERFACE_CHANGE_CB(lambda _ctx, _row, _kind: self.changed.set())
+        self._notify_handle: Optional[wintypes.HANDLE] = wintypes.HANDLE()
+        if _NotifyIpInterfaceChange(AF_UNSPEC, self._notify_cb, None, False,
+                                    ctypes.byref(self._notify_handle)) != 0:
+            self._notify_handle = None   # fall back to rescanning every RESCAN_S
+        self.rescan()
+
+    def close(self) -> None:
+        if self._notify_handle is not None:
+            _CancelMibChangeNotify2(self._notify_handle)
+            self._notify_handle = None
+
+    def rescan(self) -> None:
+        size = wintypes.ULONG(self._buf_size)
+        while True:
+            buf = ctypes.create_string_buffer(size.value)
+            rc = _GetAdaptersAddresses(AF_UNSPEC, GAA_FLAGS, None, buf, ctypes.byref(size))
+            if rc != ERROR_BUFFER_OVERFLOW: break
+        self._buf_size = size.value
+        luids = []
+        if rc == 0:
+            p = ctypes.cast(buf, ctypes.POINTER(IP_ADAPTER_ADDRESSES))
+            while p:
+                a = p.contents
+                if a.IfType != IF_TYPE_SOFTWARE_LOOPBACK and a.OperStatus == IF_OPER_STATUS_UP:
+                    luids.append(a.Luid)
+                p = a.Next
+        if luids != self.luids:
+            self.rescanned = True
+        self.luids = luids
+        self.last_refresh = time.monotonic()
+
+    def read(self) -> Snapshot:
+        self.rescanned = False
+        if self.changed.is_set():
+            self.changed.clear()
+            self.rescan()
+        elif self._notify_handle is None and time.monotonic() - self.last_refresh >= RESCAN_S:
+            self.rescan()
+        row = self._row
+        sent = recv = 0
+        for luid in self.luids:
+            row.InterfaceLuid = luid
+            row.InterfaceIndex = 0
+            if _GetIfEntry2(ctypes.byref(row)) != 0:
+                # adapter went away: totals jump, so rescan and restart the baseline
+                self.rescanned = True
+                self.changed.set()
+                continue
+            sent += row.OutOctets
+            recv += row.InOctets
+        return Snapshot(sent, recv, time.monotonic_ns())
+
 # ====== units / coloring ======
 UNITS_MODE = "bits"   # "bits" or "bytes"
 FORCE_UNIT = None     # e.g., "MB/s", "Kbps", etc., or None for auto
 
-def format_rate(bytes_per_sec: float, mode: str="bits", force_unit: Optional[str]=None) -> str:
-    if mode == "bytes":
-        value = bytes_per_sec
-        units = ["B/s", "KB/s", "MB/s", "GB/s", "TB/s"]
-        step = 1024.0
-    else:
-        value = bytes_per_sec * 8.0
-        units = ["bps", "Kbps", "Mbps", "Gbps", "Tbps"]
-        step = 1000.0
-
+UNITS_BITS = ("bps", "Kbps", "Mbps", "Gbps", "Tbps")
+UNITS_BYTES = ("B/s", "KB/s", "MB/s", "GB/s", "TB/s")
+_POW_1000 = tuple(1000.0 ** i for i in range(5))
+_POW_1024 = tuple(1024.0 ** i for i in range(5))
+# mode -> (unit names, unit sizes, multiplier from bytes/s)
+UNIT_TABLES = {
+    "bits": (UNITS_BITS, _POW_1000, 8.0),
+    "bytes": (UNITS_BYTES, _POW_1024, 1.0),
+}
+
+def format_rate(value: float, units: Tuple[str, ...], pows: Tuple[float, ...],
+                force_unit: Optional[str]=None) -> str:
+    """Format `value` (in the base unit of `units`) with an auto-picked or forced unit."""
     if force_unit and force_unit in units:
         idx = units.index(force_unit)
-        scaled = value / (step ** idx)
-        return _fmt_value(scaled) + f" {force_unit}"
-
-    idx = 0
-    while value >= step and idx < len(units) - 1:
-        value /= step
-        idx += 1
-    return _fmt_value(value) + f" {units[idx]}"
+    elif value < pows[1]: idx = 0
+    elif value < pows[2]: idx = 1
+    elif value < pows[3]: idx = 2
+    elif value < pows[4]: idx = 3
+    else:                 idx = 4
+    return _fmt_value(value / pows[idx]) + " " + units[idx]
 
 def _fmt_value(v: float) -> str:
     if v >= 100: return f"{v:.0f}"
@@ -127,68 +435,89 @@ def _fmt_value(v: float) -> str:
     if v >= 1:   return f"{v:.2f}"
     return f"{v:.2f}" if v > 0 else "0"
 
-def color_for_mbps(mbps: float) -> str:
-    if mbps < 5:   return "#46BE5A"
-    if mbps < 50:  return "#FFAA28"
-    return "#E64646"
+# color thresholds in bytes/s, so the raw rate can be compared directly
+_BPS_AMBER = 625_000.0     # 5 Mbps
+_BPS_RED = 6_250_000.0     # 50 Mbps
 
-@dataclass
-class Snapshot:
-    sent: int
-    recv: int
-    ts: float
+def _color_for_bps(bps: float) -> str:
+    if bps < _BPS_AMBER: return "#46BE5A"
+    if bps < _BPS_RED:   return "#FFAA28"
+    return "#E64646"
 
 # ====== UI: strip ======
 class CornerStrip(QWidget):
-    def __init__(self, app_icon: QIcon, up_pix: QPixmap, down_pix: QPixmap):
+    tray_moved = pyqtSignal()
+    session_locked = pyqtSignal(bool)
+
+    def __init__(self, app_icon: QIcon, up_pix: QPixmap, down_pix: QPixmap, settings: dict):
         super().__init__()
         self.setWindowTitle(APP_NAME)
         self.setWindowFlags(Qt.WindowType.FramelessWindowHint | Qt.WindowType.Tool | Qt.WindowType.WindowStaysOnTopHint)
         self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground, True)
         self.setWindowIcon(app_icon)
 
-        self.lbl_down_icon = QLabel();  self.lbl_down_icon.setPixmap(down_pix)
-        self.lbl_down = QLabel("↓ …")
-        self.lbl_sep = QLabel(" | ");   self.lbl_sep.setStyleSheet("color:#8a8a8a;")
-        self.lbl_up_icon = QLabel();    self.lbl_up_icon.setPixmap(up_pix)
-        self.lbl_up = QLabel("↑ …")
-
-        for lbl in (self.lbl_down, self.lbl_up):
-            f = QFont("Segoe UI", 9); f.setBold(True); lbl.setFont(f)
-            lbl.setStyleSheet("color:white;")
-
-        self.btn_pin = QLabel()  # pin toggle
-        self.btn_pin.setCursor(Qt.CursorShape.PointingHandCursor)
-
-        lay = QHBoxLayout(self)
-        lay.setContentsMargins(10, 2, 10, 2)
-        lay.setSpacing(6)
-        lay.addWidget(self.lbl_down_icon)
-        lay.addWidget(self.lbl_down)
-        lay.addWidget(self.lbl_sep)
-        lay.addWidget(self.lbl_up_icon)
-        lay.addWidget(self.lbl_up)
-        lay.addStretch()
-        lay.addWidget(self.btn_pin)
+        # everything is painted in paintEvent; no child widgets, no layout
+        self.up_pix, self.down_pix = up_pix, down_pix
+        self.rate_font = QFont("Segoe UI", 9); self.rate_font.setBold(True)
+        self._rate_fm = QFontMetrics(self.rate_font)
+        self._fm = QFontMetrics(self.font())
+        self._sep_color = QColor("#8a8a8a")
+        self._up_text, self._dn_text = "↑ …", "↓ …"
+        self._up_color = self._dn_color = QColor("white")
+        self._pin_rect = QRect()
+        self._rates = None
+        self._bg: Optional[QPixmap] = None   # cached background, see _render_bg
+        self.setMouseTracking(True)   # for the pin's hand cursor
 
         self.resize(W, H)
 
         self.click_through = True
         self._drag: Optional[QPoint] = None
+        self._ex_style: Optional[int] = None   # cached GWL_EXSTYLE of _ex_hwnd
+        self._ex_hwnd: Optional[int] = None
 
         # pin icons (optional)
-        self.pin_off = QPixmap(asset_path("pin_off.png")) if os.path.exists(asset_path("pin_off.png")) else None
-        self.pin_on  = QPixmap(asset_path("pin_on.png"))  if os.path.exists(asset_path("pin_on.png"))  else None
+        self.pin_off = load_asset(QPixmap, "pin_off.png")
+        self.pin_on  = load_asset(QPixmap, "pin_on.png")
         self._update_pin_icon()
-        self.btn_pin.mousePressEvent = self._toggle_pin_click
 
         # shortcuts
         QShortcut(QKeySequence("Ctrl+Shift+L"), self, activated=self.toggle_lock)
         QShortcut(QKeySequence("Ctrl+Shift+U"), self, activated=self.toggle_units)
 
+        # re-dock when the taskbar moves (WinEvent hook + nativeEvent)
+        self._tray_placement = None   # get_taskbar_placement() at the last snap
+        self._docked_pos: Optional[QPoint] = None
+        self._tray_settle = QTimer(self)
+        self._tray_settle.setSingleShot(True)
+        self._tray_settle.setInterval(TRAY_SETTLE_MS)
+        self._tray_settle.timeout.connect(self._check_tray)
+        self.tray_moved.connect(self._tray_settle.start)
+        self.tray_timer = QTimer(self)   # fallback poll, started only if hooking fails
+        self.tray_timer.setTimerType(Qt.TimerType.VeryCoarseTimer)
+        self.tray_timer.timeout.connect(self._check_tray)
+        self._tray_hwnd = 0
+        self._tray_hook = None
+        self._tray_autohide = False   # refreshed on hook_tray() and WM_SETTINGCHANGE
+        self._tray_hook_proc = _WINEVENTPROC(self._on_tray_event)
+        self.hook_tray()
+
+        # WM_WTSSESSION_CHANGE -> session_locked, so the app can pause while locked
+        self._session_hwnd = int(self.winId())
+        if not _WTSRegisterSessionNotification(self._session_hwnd, NOTIFY_FOR_THIS_SESSION):
+            self._session_hwnd = None
+
+        # settings live in memory; writes are debounced through _save_timer
+        self._settings = settings
+        self._dirty = False
+        self._save_timer = QTimer(self)
+        self._save_timer.setSingleShot(True)
+        self._save_timer.setInterval(SAVE_DELAY_MS)
+        self._save_timer.timeout.connect(self._flush_settings)
+
         # restore persisted state
-        st = load_settings()
-        if "pos" in st:
+        st = self._settings
+        if "pos" in st and not st.get("docked"):
             self.move(st["pos"][0], st["pos"][1])
         else:
             self.snap_to_tray()
@@ -207,40 +536,61 @@ class CornerStrip(QWidget):
     def toggle_lock(self):
         self.set_locked(not self.click_through)
 
-    def _toggle_pin_click(self, _e):
-        self.toggle_lock()
-
     def _update_pin_icon(self):
+        # the pin is either a pixmap or an emoji, right-aligned; cache its rect for hit-testing
         if self.click_through:
-            if self.pin_on:  self.btn_pin.setPixmap(self.pin_on)
-            else:            self.btn_pin.setText("📌")
-            self.btn_pin.setToolTip("Pinned (click to unpin and drag)")
+            self._pin = self.pin_on if self.pin_on else "📌"
+            self._pin_tip = "Pinned (click to unpin and drag)"
+        else:
+            self._pin = self.pin_off if self.pin_off else "📍"
+            self._pin_tip = "Unpinned (drag me, then click to pin)"
+        if isinstance(self._pin, QPixmap):
+            sz = self._pin.deviceIndependentSize().toSize()
+            pw, ph = sz.width(), sz.height()
         else:
-            if self.pin_off: self.btn_pin.setPixmap(self.pin_off)
-            else:            self.btn_pin.setText("📍")
-            self.btn_pin.setToolTip("Unpinned (drag me, then click to pin)")
+            pw, ph = self._fm.horizontalAdvance(self._pin), self._fm.height()
+        self._pin_rect = QRect(W - PAD_X - pw, (H - ph) // 2, pw, ph)
+        self.update()
+
+    def set_rates(self, up_text: str, dn_text: str, up_color: str, dn_color: str):
+        """Show new rate strings; repaints only if something visible changed."""
+        if (up_text, dn_text, up_color, dn_color) == self._rates: return
+        self._rates = (up_text, dn_text, up_color, dn_color)
+        self._up_text, self._dn_text = "↑ " + up_text, "↓ " + dn_text
+        self._up_color, self._dn_color = QColor(up_color), QColor(dn_color)
+        self.update()
 
     def _apply_click_through(self, enable: bool):
         hwnd = int(self.winId())
-        ex = win32gui.GetWindowLong(hwnd, win32con.GWL_EXSTYLE)
+        if self._ex_style is None or self._ex_hwnd != hwnd:
+            self._ex_style = win32gui.GetWindowLong(hwnd, GWL_EXSTYLE)
+            self._ex_hwnd = hwnd
+        ex = self._ex_style | WS_EX_LAYERED
         if enable:
-            ex |= win32con.WS_EX_TRANSPARENT | win32con.WS_EX_LAYERED
+            ex |= WS_EX_TRANSPARENT
         else:
-            ex &= ~(win32con.WS_EX_TRANSPARENT)
-            ex |= win32con.WS_EX_LAYERED
-        win32gui.SetWindowLong(hwnd, win32con.GWL_EXSTYLE, ex)
+            ex &= ~WS_EX_TRANSPARENT
+        if ex == self._ex_style: return
+        win32gui.SetWindowLong(hwnd, GWL_EXSTYLE, ex)
+        self._ex_style = ex
 
     def toggle_units(self):
         global UNITS_MODE
         UNITS_MODE = "bytes" if UNITS_MODE == "bits" else "bits"
-        st = load_settings(); st["units"] = UNITS_MODE; save_settings(st)
+        self._settings["units"] = UNITS_MODE
+        self._mark_dirty()
 
     def mousePressEvent(self, e):
+        if self._pin_rect.contains(e.position().toPoint()):
+            self.toggle_lock()
+            return
         if self.click_through: return
         if e.button() == Qt.MouseButton.LeftButton:
             self._drag = e.globalPosition().toPoint() - self.frameGeometry().topLeft()
 
     def mouseMoveEvent(self, e):
+        over_pin = self._pin_rect.contains(e.position().toPoint())
+        self.setCursor(Qt.CursorShape.PointingHandCursor if over_pin else Qt.CursorShape.ArrowCursor)
         if self.click_through or self._drag is None: return
         if e.buttons() & Qt.MouseButton.LeftButton:
             self.move(e.globalPosition().toPoint() - self._drag)
@@ -250,48 +600,212 @@ class CornerStrip(QWidget):
         self._drag = None
         self._persist()
 
-    def paintEvent(self, _):
-        from PyQt6.QtGui import QPainter, QColor
-        p = QPainter(self)
+    def event(self, e):
+        if e.type() == QEvent.Type.ToolTip:
+            if self._pin_rect.contains(e.pos()):
+                QToolTip.showText(e.globalPos(), self._pin_tip, self)
+            else:
+                QToolTip.hideText()
+            return True
+        return super().event(e)
+
+    def resizeEvent(self, e):
+        self._render_bg()
+        super().resizeEvent(e)
+
+    def _render_bg(self):
+        # the antialiased rounded rect only changes with size/DPR; paint it once and blit it
+        dpr = self.devicePixelRatioF()
+        bg = QPixmap(round(self.width() * dpr), round(self.height() * dpr))
+        bg.setDevicePixelRatio(dpr)
+        bg.fill(Qt.GlobalColor.transparent)
+        p = QPainter(bg)
         p.setRenderHint(QPainter.RenderHint.Antialiasing)
         p.setPen(QColor(255,255,255,40))
         p.setBrush(QColor(18,18,20,220))
         p.drawRoundedRect(self.rect(), 8, 8)
+        p.end()
+        self._bg = bg
+
+    def paintEvent(self, _):
+        if self._bg is None or self._bg.devicePixelRatio() != self.devicePixelRatioF():
+            self._render_bg()   # first paint, or moved to a screen with another scale
+        p = QPainter(self)
+        p.drawPixmap(0, 0, self._bg)
+
+        # ↓icon ↓rate | ↑icon ↑rate ........ pin
+        x = PAD_X
+        x = self._paint_pixmap(p, x, self.down_pix)
+        x = self._paint_text(p, x, self._dn_text, self._dn_color, self.rate_font, self._rate_fm)
+        x = self._paint_text(p, x, " | ", self._sep_color, self.font(), self._fm)
+        x = self._paint_pixmap(p, x, self.up_pix)
+        self._paint_text(p, x, self._up_text, self._up_color, self.rate_font, self._rate_fm)
+        if isinstance(self._pin, QPixmap):
+            p.drawPixmap(self._pin_rect.topLeft(), self._pin)
+        else:
+            p.setFont(self.font())
+            p.setPen(QColor("white"))
+            p.drawText(self._pin_rect, Qt.AlignmentFlag.AlignCenter, self._pin)
+
+    def _paint_pixmap(self, p: QPainter, x: int, pix: QPixmap) -> int:
+        if pix.isNull(): return x
+        sz = pix.deviceIndependentSize().toSize()
+        p.drawPixmap(x, (H - sz.height()) // 2, pix)
+        return x + sz.width() + GAP
+
+    def _paint_text(self, p: QPainter, x: int, text: str, color: QColor,
+                    font: QFont, fm: QFontMetrics) -> int:
+        w = fm.horizontalAdvance(text)
+        p.setFont(font)
+        p.setPen(color)
+        p.drawText(QRect(x, PAD_Y, w, H - 2 * PAD_Y),
+                   Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter, text)
+        return x + w + GAP
 
     def snap_to_tray(self):
         rect = get_tray_rect()
+        screen = QApplication.primaryScreen().geometry()
         if not rect:
-            screen = QApplication.primaryScreen().geometry()
             self.move(screen.right() - self.width() - MARGIN_PX,
                       screen.bottom() - self.height() - MARGIN_PX)
         else:
             l,t,r,b = rect
-            screen = QApplication.primaryScreen().geometry()
             x = r - self.width() - MARGIN_PX
             y = t - self.height() - MARGIN_PX
             if abs(t - screen.top()) < 10:  y = b + MARGIN_PX
             if abs(l - screen.left()) < 10: x = r + MARGIN_PX; y = b - self.height() - MARGIN_PX
             if abs(r - screen.right()) < 10:x = l - self.width() - MARGIN_PX; y = b - self.height() - MARGIN_PX
             self.move(x, y)
+        self._tray_placement = get_taskbar_placement()
+        self._docked_pos = self.pos()
         self._persist()
 
+    def is_docked(self) -> bool:
+        return self._docked_pos is not None and self.pos() == self._docked_pos
+
+    def _check_tray(self):
+        # only follow the taskbar if the user hasn't dragged us elsewhere
+        if self.is_docked() and get_taskbar_placement() != self._tray_placement:
+            self.snap_to_tray()
+
+    def hook_tray(self):
+        self.unhook_tray()
+        self._tray_hwnd, _ = find_tray_windows()
+        self._tray_autohide = taskbar_autohide()
+        if self._tray_hwnd:
+            pid = wintypes.DWORD()
+            tid = _GetWindowThreadProcessId(self._tray_hwnd, ctypes.byref(pid))
+            self._tray_hook = _SetWinEventHook(
+                EVENT_OBJECT_LOCATIONCHANGE, EVENT_OBJECT_LOCATIONCHANGE, None,
+                self._tray_hook_proc, pid.value, tid, WINEVENT_OUTOFCONTEXT) or None
+        if self._tray_hook is None:
+            self.tray_timer.start(TRAY_CHECK_MS)
+        else:
+            self.tray_timer.stop()
+
+    def unhook_tray(self):
+        if self._tray_hook is not None:
+            _UnhookWinEvent(self._tray_hook)
+            self._tray_hook = None
+
+    def unregister_session(self):
+        if self._session_hwnd is not None:
+            _WTSUnRegisterSessionNotification(self._session_hwnd)
+            self._session_hwnd = None
+
+    def _on_tray_event(self, _hook, _event, hwnd, id_object, _id_child, _thread, _time):
+        # the hook sees every object on Explorer's thread; only the taskbar itself matters.
+        # An auto-hide bar moves on every reveal/hide; its real moves come as WM_SETTINGCHANGE.
+        if self._tray_autohide: return
+        if hwnd == self._tray_hwnd and id_object == OBJID_WINDOW:
+            self.tray_moved.emit()
+
+    def nativeEvent(self, event_type, message):
+        if event_type == b"windows_generic_MSG":
+            msg = wintypes.MSG.from_address(int(message))
+            if msg.message in (WM_SETTINGCHANGE, WM_DISPLAYCHANGE):
+                if msg.message == WM_SETTINGCHANGE:
+                    self._tray_autohide = taskbar_autohide()
+                self.tray_moved.emit()
+            elif msg.message == WM_TASKBARCREATED:
+                self.hook_tray()
+                self.tray_moved.emit()
+            elif msg.message == WM_WTSSESSION_CHANGE:
+                if msg.wParam == WTS_SESSION_LOCK:     self.session_locked.emit(True)
+                elif msg.wParam == WTS_SESSION_UNLOCK: self.session_locked.emit(False)
+        return super().nativeEvent(event_type, message)
+
     def _persist(self):
-        st = load_settings()
+        st = self._settings
         st["pos"] = [self.x(), self.y()]
         st["locked"] = self.click_through
-        save_settings(st)
+        st["docked"] = self.is_docked()
+        self._mark_dirty()
+
+    def _mark_dirty(self):
+        self._dirty = True
+        self._save_timer.start()
+
+    def _flush_settings(self):
+        self._save_timer.stop()
+        if self._dirty:
+            self._dirty = False
+            save_settings(self._settings)
+
+# ====== counter polling (worker thread) ======
+class CounterWorker(QObject):
+    """Reads the counters every REFRESH_MS on its own thread, off the GUI thread.
+
+    Each tick emits `sample(snapshot, rebased)`; `rebased` means the snapshot
+    can't be diffed against the previous one (adapter set changed).
+    """
+    sample = pyqtSignal(object, bool)
+
+    def __init__(self):
+        super().__init__()
+        self.net_src: Optional[NetCounterSource] = None   # created on the first tick, after first paint
+        self.timer = QTimer(self)   # moves to the worker thread along with us
+        self.timer.setTimerType(Qt.TimerType.CoarseTimer)   # allow Windows to batch our wakeups
+        self.timer.timeout.connect(self._tick)
+
+    @pyqtSlot()
+    def start(self):
+        self.timer.start(REFRESH_MS)
+
+    @pyqtSlot()
+    def stop(self):
+        self.timer.stop()
+
+    @pyqtSlot()
+    def close(self):
+        self.timer.stop()
+        if self.net_src is not None:
+            self.net_src.close()
+            self.net_src = None
+
+    def _tick(self):
+        if self.net_src is None:
+            self.net_src = NetCounterSource()
+        snap = self.net_src.read()
+        self.sample.emit(snap, self.net_src.rescanned)
 
 # ====== app ======
 class App(QApplication):
+    # queued into the counter thread
+    poll_start = pyqtSignal()
+    poll_stop = pyqtSignal()
+    poll_close = pyqtSignal()
+
     def __init__(self, argv):
         super().__init__(argv)
         self.setApplicationName(APP_NAME)
 
-        app_icon = QIcon(asset_path("app.ico")) if os.path.exists(asset_path("app.ico")) else QIcon()
-        up_pix = QPixmap(asset_path("upload.png")) if os.path.exists(asset_path("upload.png")) else QPixmap()
-        down_pix = QPixmap(asset_path("download.png")) if os.path.exists(asset_path("download.png")) else QPixmap()
+        app_icon = load_asset(QIcon, "app.ico", QIcon())
+        up_pix = load_asset(QPixmap, "upload.png", QPixmap())
+        down_pix = load_asset(QPixmap, "download.png", QPixmap())
 
-        self.strip = CornerStrip(app_icon, up_pix, down_pix)
+        self._settings = load_settings()   # read once; the strip owns writing it back
+        self.strip = CornerStrip(app_icon, up_pix, down_pix, self._settings)
         self.strip.show()
 
         self.tray = QSystemTrayIcon(app_icon if not app_icon.isNull() else QIcon())
@@ -325,24 +839,35 @@ class App(QApplication):
         menu.addSeparator()
 
         quit_act = QAction("Quit")
-        quit_act.triggered.connect(self.quit_app)
+        quit_act.triggered.connect(self.quit)
         menu.addAction(quit_act)
 
         self.tray.setContextMenu(menu)
         # Only toggle on **double-click** to avoid accidental hides from click-through
         self.tray.activated.connect(self.tray_click)
         self.tray.show()
+        self.aboutToQuit.connect(self._on_about_to_quit)
 
         self.prev: Optional[Snapshot] = None
-        self.timer = QTimer(self)
-        self.timer.timeout.connect(self.refresh)
-        self.timer.start(REFRESH_MS)
+        self.counter_thread = QThread(self)
+        self.worker = CounterWorker()
+        self.worker.moveToThread(self.counter_thread)
+        self.worker.sample.connect(self._on_sample)
+        self.poll_start.connect(self.worker.start)
+        self.poll_stop.connect(self.worker.stop)
+        self.poll_close.connect(self.worker.close, Qt.ConnectionType.BlockingQueuedConnection)
+        self.counter_thread.start()
+        self._polling = True
+        self.poll_start.emit()
+
+        # nobody sees the meter while it's hidden or the session is locked
+        self._session_locked = False
+        self.strip.session_locked.connect(self._on_session_locked)
 
         # restore units mode
-        st = load_settings()
-        if st.get("units") in ("bits", "bytes"):
+        if self._settings.get("units") in ("bits", "bytes"):
             global UNITS_MODE
-            UNITS_MODE = st["units"]
+            UNITS_MODE = self._settings["units"]
 
     def tray_click(self, reason):
         if reason == QSystemTrayIcon.ActivationReason.DoubleClick:
@@ -355,33 +880,51 @@ class App(QApplication):
         else:
             self.strip.show()
             self.act_show_hide.setText("Hide Meter")
+        self._update_polling()
+
+    def _on_session_locked(self, locked: bool):
+        self._session_locked = locked
+        self._update_polling()
+
+    def _update_polling(self):
+        polling = self.strip.isVisible() and not self._session_locked
+        if polling == self._polling: return
+        self._polling = polling
+        if polling:
+            self.prev = None   # the old baseline would average over the pause
+            self.poll_start.emit()
+        else:
+            self.poll_stop.emit()
 
-    def quit_app(self):
+    def _on_about_to_quit(self):
+        # runs for tray "Quit" and for logoff/shutdown, which never go through the menu;
+        # save first, since the session may end before the rest of the cleanup finishes
         self.strip._persist()
+        self.strip._flush_settings()
+        self.poll_close.emit()   # blocks until the worker has cleaned up
+        self.counter_thread.quit()
+        self.counter_thread.wait()
+        self.strip.unhook_tray()
+        self.strip.unregister_session()
         self.tray.hide()
-        self.quit()
 
-    def refresh(self):
-        c = psutil.net_io_counters(pernic=False)
-        now = time.time()
-        if self.prev is None:
-            self.prev = Snapshot(c.bytes_sent, c.bytes_recv, now)
+    def _on_sample(self, snap: Snapshot, rebased: bool):
+        if not self._polling: return   # queued before a stop
+        if self.prev is None or rebased:
+            self.prev = snap
             return
 
-        dt = max(1e-6, now - self.prev.ts)
-        up_Bps = (c.bytes_sent - self.prev.sent) / dt
-        dn_Bps = (c.bytes_recv - self.prev.recv) / dt
-
-        up_Mbps = (up_Bps * 8.0) / 1_000_000
-        dn_Mbps = (dn_Bps * 8.0) / 1_000_000
+        dt_ns = snap.ts - self.prev.ts
+        up_Bps = (snap.sent - self.prev.sent) * 1_000_000_000 / dt_ns
+        dn_Bps = (snap.recv - self.prev.recv) * 1_000_000_000 / dt_ns
 
-        up_txt = format_rate(up_Bps, UNITS_MODE, FORCE_UNIT)
-        dn_txt = format_rate(dn_Bps, UNITS_MODE, FORCE_UNIT)
+        units, pows, mul = UNIT_TABLES[UNITS_MODE]
+        up_txt = format_rate(up_Bps * mul, units, pows, FORCE_UNIT)
+        dn_txt = format_rate(dn_Bps * mul, units, pows, FORCE_UNIT)
 
-        self.strip.lbl_up.setText(f"<span style='color:{color_for_mbps(up_Mbps)};'>↑ {up_txt}</span>")
-        self.strip.lbl_down.setText(f"<span style='color:{color_for_mbps(dn_Mbps)};'>↓ {dn_txt}</span>")
+        self.strip.set_rates(up_txt, dn_txt, _color_for_bps(up_Bps), _color_for_bps(dn_Bps))
 
-        self.prev = Snapshot(c.bytes_sent, c.bytes_recv, now)
+        self.prev = snap
 
 def main():
     app = App(sys.argv)